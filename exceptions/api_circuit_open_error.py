@@ -0,0 +1,2 @@
+class ApiCircuitOpenError(Exception):
+    """Запросы к API приостановлены после серии ошибок подряд."""
@@ -1,5 +1,6 @@
 import sys
 import os
+import random
 import requests
 import time
 import logging
@@ -9,6 +10,12 @@ from typing import Optional, Any
 from telebot import TeleBot
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from exceptions.api_circuit_open_error import ApiCircuitOpenError
 from exceptions.api_request_error import ApiHomeworkError
 
 
@@ -22,8 +29,42 @@ TELEGRAM_TOKEN: Optional[str] = os.getenv('TG_TOKEN')
 TELEGRAM_CHAT_ID: Optional[str] = os.getenv('USER_ID')
 
 RETRY_PERIOD: int = 600
+# Период опроса, пока работа на проверке, и верхняя граница периода
+# при увеличении паузы на повторяющихся пустых ответах (в секундах).
+REVIEWING_RETRY_PERIOD: int = 60
+MAX_RETRY_PERIOD: int = 3600
 ENDPOINT: str = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
-HEADERS: dict[str, str] = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+HEADERS: dict[str, str] = {
+    'Authorization': f'OAuth {PRACTICUM_TOKEN}',
+    'Accept-Encoding': 'gzip, deflate',
+}
+
+# Таймауты запроса к API: на соединение и на чтение ответа (в секундах).
+REQUEST_TIMEOUT: tuple[int, int] = (5, 30)
+
+# Повторные запросы к API при временных сбоях: число попыток
+# и максимальная пауза между ними (в секундах).
+RETRY_ATTEMPTS: int = 5
+RETRY_BACKOFF_CAP: int = 30
+RETRY_STATUSES: frozenset[int] = frozenset({
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+})
+
+# Последний ответ API с ETag: (from_date, ETag, данные ответа).
+# Позволяет отправлять условный запрос и не разбирать ответ `304`.
+cached_answer: Optional[tuple[int, str, dict[str, Any]]] = None
+
+# После `BREAKER_THRESHOLD` неудачных обращений к API подряд запросы
+# приостанавливаются на `BREAKER_COOLDOWN` секунд, затем выполняется
+# пробный запрос. Пауза кратна `RETRY_PERIOD`, иначе она истекала бы
+# раньше следующего опроса и ни один запрос не пропускался бы.
+BREAKER_THRESHOLD: int = 5
+BREAKER_COOLDOWN: int = RETRY_PERIOD * 6
+api_failures: int = 0
+breaker_open_until: float = 0.0
 
 
 HOMEWORK_VERDICTS: dict[str, str] = {
@@ -31,56 +72,158 @@ HOMEWORK_VERDICTS: dict[str, str] = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+# Готовые шаблоны сообщений: остаётся подставить название работы.
+VERDICT_TEMPLATES: dict[str, str] = {
+    status: f'Изменился статус проверки работы "{{}}". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
 
 
 def check_tokens() -> bool:
     """Возвращает True, если все переменные окружения на месте."""
-    tokens: dict[str, Optional[str]] = {
-        'PRACTICUM_TOKEN': PRACTICUM_TOKEN,
-        'TELEGRAM_TOKEN': TELEGRAM_TOKEN,
-        'TELEGRAM_CHAT_ID': TELEGRAM_CHAT_ID
-    }
-    missing_tokens: list[str] = [
-        name for name, token in tokens.items() if not token
-    ]
+    tokens: tuple[tuple[str, Optional[str]], ...] = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID),
+    )
+    missing_tokens: list[str] = [name for name, token in tokens if not token]
     if missing_tokens:
         logger.critical(
-            'Отсутствуют обязательные переменные окружения: '
-            f'{", ".join(missing_tokens)}.'
-        )
-        raise EnvironmentError(
-            'Отсутствуют обязательные переменные окружения: '
-            f'{", ".join(missing_tokens)}.'
+            'Отсутствуют обязательные переменные окружения: %s.',
+            ', '.join(missing_tokens)
         )
-    return True
+    return not missing_tokens
 
 
 def send_message(bot: TeleBot, message: str) -> bool:
     """Отправляет сообщение пользователю в чат Телеграмм."""
     bot.send_message(TELEGRAM_CHAT_ID, message)
-    logger.debug(f'Сообщение отправлено успешно: {message}.')
+    logger.debug('Сообщение отправлено успешно: %s.', message)
 
 
-def get_api_answer(timestamp: int) -> dict[str, Any]:
-    """Получает ответ с API-сервиса Яндекс Домашка."""
-    try:
-        response = requests.get(
-            url=ENDPOINT, headers=HEADERS, params={'from_date': timestamp}
+def get_retry_delay(
+    attempt: int, response: Optional[requests.Response] = None
+) -> float:
+    """
+    Возвращает паузу перед повторным запросом к API.
+
+    Если сервер прислал заголовок `Retry-After`, используется он,
+    иначе - экспоненциальная пауза со случайной добавкой.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return int(retry_after)
+    return min(2 ** attempt + random.random(), RETRY_BACKOFF_CAP)
+
+
+def request_with_retry(
+    timestamp: int, headers: dict[str, str]
+) -> requests.Response:
+    """
+    Отправляет запрос к API, повторяя его при временных сбоях.
+
+    Повтор выполняется при ошибке соединения, таймауте и статус-кодах
+    из `RETRY_STATUSES`; после последней попытки ошибка пробрасывается.
+    Если `Retry-After` больше `RETRY_BACKOFF_CAP`, ответ возвращается
+    без повтора.
+    """
+    for attempt in range(RETRY_ATTEMPTS):
+        is_last_attempt = attempt == RETRY_ATTEMPTS - 1
+        try:
+            response = requests.get(
+                url=ENDPOINT,
+                headers=headers,
+                params={'from_date': timestamp},
+                timeout=REQUEST_TIMEOUT
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if is_last_attempt:
+                raise
+            delay = get_retry_delay(attempt)
+            reason = str(e)
+        else:
+            if is_last_attempt or response.status_code not in RETRY_STATUSES:
+                return response
+            delay = get_retry_delay(attempt, response)
+            # Сервер просит ждать дольше допустимого: не блокируем
+            # опрос, ответ обработается как обычная ошибка HTTP.
+            if delay > RETRY_BACKOFF_CAP:
+                return response
+            reason = f'статус-код {response.status_code}'
+        logger.warning(
+            'Временный сбой запроса к API (%s), повтор через %.1f с.',
+            reason, delay
         )
+        time.sleep(delay)
+
+
+def fetch_api_answer(timestamp: int) -> dict[str, Any]:
+    """
+    Запрашивает и декодирует ответ API-сервиса Яндекс Домашка.
+
+    Если для того же `timestamp` уже есть ответ с ETag, запрос отправляется
+    с `If-None-Match`, и на `304` возвращается сохранённый ответ.
+    """
+    global cached_answer
+    cached = cached_answer
+    if cached is not None and cached[0] != timestamp:
+        cached = None
+    headers = HEADERS
+    if cached is not None:
+        headers = {**HEADERS, 'If-None-Match': cached[1]}
+    try:
+        response = request_with_retry(timestamp, headers)
     except requests.RequestException as e:
         raise ConnectionError(
             f'Ошибка запроса к API. Получена ошибка: {e}.'
         ) from e
 
+    if cached is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+        logger.debug('Ответ API не изменился с прошлого запроса.')
+        return cached[2]
     if response.status_code != HTTPStatus.OK:
         raise ApiHomeworkError(
             f'Ошибка HTTP: статус-код - {response.status_code}. '
             f'Ожидался статус: {HTTPStatus.OK}'
         )
+    logger.debug(
+        'Получен ответ API, сжатие: %s.',
+        response.headers.get('Content-Encoding', 'нет')
+    )
     try:
-        response_data = response.json()
+        if orjson is None:
+            response_data = response.json()
+        else:
+            response_data = orjson.loads(response.content)
     except ValueError as e:
         raise ValueError('Ошибка декодирования JSON из ответа API') from e
+    etag = response.headers.get('ETag')
+    cached_answer = (timestamp, etag, response_data) if etag else None
+    return response_data
+
+
+def get_api_answer(timestamp: int) -> dict[str, Any]:
+    """
+    Получает ответ с API-сервиса Яндекс Домашка.
+
+    После серии ошибок подряд запросы на время не отправляются:
+    вместо этого сразу выбрасывается `ApiCircuitOpenError`.
+    """
+    global api_failures, breaker_open_until
+    if time.monotonic() < breaker_open_until:
+        raise ApiCircuitOpenError(
+            f'API недоступно: {BREAKER_THRESHOLD} ошибок подряд, '
+            'запросы временно приостановлены.'
+        )
+    try:
+        response_data = fetch_api_answer(timestamp)
+    except Exception:
+        api_failures += 1
+        if api_failures >= BREAKER_THRESHOLD:
+            breaker_open_until = time.monotonic() + BREAKER_COOLDOWN
+        raise
+    api_failures = 0
     return response_data
 
 
@@ -92,21 +235,19 @@ def check_response(response: dict[str, Any]) -> list[dict[str, Any]]:
     'homeworks' - список домашних заданий(1 задание - словарь);
     'current_date' - числовое значение(формат UNIX-время).
 
-    Возвращает список домашних заданий.
+    Возвращает список домашних заданий(пустой, если статусы не менялись).
     """
-    keys: set = {'homeworks', 'current_date'}
     if not isinstance(response, dict):
         raise TypeError('Ожидался словарь с данными API.')
-    for key in keys:
-        if key not in response:
-            raise KeyError(
-                f'Обязательный ключ `{key}` отсутсвует в словаре API.'
-            )
-    homeworks = response.get('homeworks')
+    try:
+        homeworks = response['homeworks']
+        _ = response['current_date']
+    except KeyError as e:
+        raise KeyError(
+            f'Обязательный ключ `{e.args[0]}` отсутсвует в словаре API.'
+        ) from e
     if not isinstance(homeworks, list):
         raise TypeError('Значение под ключом `homeworks` должно быть списком!')
-    if not homeworks:
-        raise ValueError('Список домашек пуст.')
 
     return homeworks
 
@@ -124,36 +265,93 @@ def parse_status(homework: dict[str, Any]) -> Optional[str]:
     if not homework:
         raise ValueError('Пустой ответ от API Яндекс Домашка.')
     homework_name = homework.get('homework_name')
-    homework_status = homework.get('status')
-    if homework_name is None or homework_status not in HOMEWORK_VERDICTS:
+    template = VERDICT_TEMPLATES.get(homework.get('status'))
+    if homework_name is None or template is None:
         raise KeyError('Неверный формат данных для домашней работы.')
-    verdict = HOMEWORK_VERDICTS.get(homework_status)
 
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    return template.format(homework_name)
+
+
+def send_statuses(
+    bot: TeleBot,
+    homeworks: list[dict[str, Any]],
+    sent_statuses: dict[Any, str]
+) -> None:
+    """
+    Отправляет в чат Телеграмм статусы полученных домашних работ.
+
+    `sent_statuses` хранит последний отправленный статус каждой домашки
+    по её `id` (без `id` - по названию): повторно тот же статус
+    не отправляется.
+    """
+    for homework in homeworks:
+        homework_id = homework.get('id') or homework.get('homework_name')
+        status = homework.get('status')
+        if sent_statuses.get(homework_id) == status:
+            continue
+        message = parse_status(homework)
+        if message:
+            send_message(bot, message)
+            sent_statuses[homework_id] = status
+
+
+def get_retry_period(
+    last_homeworks: list[dict[str, Any]], empty_polls: int
+) -> int:
+    """
+    Возвращает паузу до следующего запроса к API.
+
+    Пока последняя полученная работа на проверке, API опрашивается чаще.
+    Иначе пауза удваивается на каждый повторный пустой ответ,
+    но не превышает `MAX_RETRY_PERIOD`.
+    """
+    if any(hw.get('status') == 'reviewing' for hw in last_homeworks):
+        return REVIEWING_RETRY_PERIOD
+    return min(
+        RETRY_PERIOD * 2 ** max(empty_polls - 1, 0), MAX_RETRY_PERIOD
+    )
 
 
 def main() -> None:
     """Основная логика работы бота."""
+    # Без переменных окружения бот работать не может.
+    if not check_tokens():
+        sys.exit('Программа остановлена: нет переменных окружения.')
     bot = TeleBot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
-    # Проверяем наличие всех переменных окружения.
-    if not check_tokens():
-        exit
     # Переменная будет хранить в себе последнее сообщение об ошибке.
     last_error_message: Optional[str] = None
+    # Последние полученные домашки и число пустых ответов подряд
+    # определяют паузу до следующего запроса.
+    last_homeworks: list[dict[str, Any]] = []
+    empty_polls: int = 0
+    # Последний отправленный статус каждой домашки.
+    sent_statuses: dict[Any, str] = {}
 
     while True:
+        # Время запроса и обработки вычитается из паузы,
+        # чтобы период опроса не смещался.
+        started_at = time.monotonic()
         try:
             response = get_api_answer(timestamp)
             homeworks = check_response(response)
-            for homework in homeworks:
-                message = parse_status(homework)
-                if message:
-                    send_message(bot, message)
-            timestamp = response.get('current_date', timestamp)
+            # Пока изменений нет, `from_date` не сдвигаем: запрос остаётся
+            # тем же, и на него можно получить `304` по ETag.
+            if homeworks:
+                send_statuses(bot, homeworks, sent_statuses)
+                # Сдвигаем только после отправки: при сбое тот же статус
+                # будет получен и отправлен на следующем опросе.
+                timestamp = response.get('current_date', timestamp)
+                last_homeworks = homeworks
+                empty_polls = 0
+            else:
+                logger.debug('Статусы домашних работ не изменились.')
+                empty_polls += 1
             last_error_message = None
+            retry_period = get_retry_period(last_homeworks, empty_polls)
 
         except Exception as e:
+            retry_period = RETRY_PERIOD
             error_message = f'Сбой в работе программы: {e}'
             logger.error(error_message)
             # Если текущая ошибка отличается от предыдущей,
@@ -163,10 +361,12 @@ def main() -> None:
                     send_message(bot, f'Сбой в работе программы: {e}')
                 except Exception as e:
                     logger.error(
-                        f'Не удалось отправить сообщение об ошибке: {e}.'
+                        'Не удалось отправить сообщение об ошибке: %s.', e
                     )
                 last_error_message = error_message
-        time.sleep(RETRY_PERIOD)
+        elapsed = time.monotonic() - started_at
+        delay = max(0, round(retry_period - elapsed))
+        time.sleep(delay)
 
 
 if __name__ == '__main__':
@@ -1,3 +1,4 @@
+import json
 import logging
 import signal
 import re
@@ -91,11 +92,13 @@ class MockResponseGET:
         self.status_code = http_status
         self.reason = ''
         self.text = ''
+        self.headers = {}
         default_data = {
             'homeworks': [],
             'current_date': self.random_timestamp
         }
         self.data = data if data is not None else default_data
+        self.content = json.dumps(self.data).encode()
         logging.warn(MockResponseGET.CALLED_LOG_MSG)
 
     def json(self):
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 import pytest_timeout
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -23,6 +24,15 @@ pytest_plugins = [
     'tests.fixtures.fixture_data'
 ]
 
+
+@pytest.fixture(autouse=True)
+def reset_homework_state(monkeypatch, homework_module):
+    """Reset module-level state of `homework.py` before every test."""
+    monkeypatch.setattr(homework_module, 'api_failures', 0)
+    monkeypatch.setattr(homework_module, 'breaker_open_until', 0.0)
+    monkeypatch.setattr(homework_module, 'cached_answer', None)
+
+
 TIMEOUT_ASSERT_MSG = (
     'Проект работает некорректно, проверка прервана.\n'
     'Вероятные причины ошибки:\n'
@@ -0,0 +1,367 @@
+from http import HTTPStatus
+
+import inspect
+
+import pytest
+import requests
+
+import tests.check_utils as check_utils
+
+
+@pytest.fixture
+def sleeps(monkeypatch, homework_module):
+    """Record pauses made by `homework.py` instead of sleeping."""
+    calls = []
+    monkeypatch.setattr(homework_module.time, 'sleep', calls.append)
+    return calls
+
+
+@pytest.fixture
+def main_env(monkeypatch, homework_module):
+    """Provide tokens and a mock bot so that `main()` can run."""
+    monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+    monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdef')
+    monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+    monkeypatch.setattr(
+        homework_module, 'TeleBot', check_utils.MockTelegramBot
+    )
+
+
+def mock_responses(monkeypatch, *results):
+    """Make `requests.get` return or raise `results` in order."""
+    calls = []
+
+    def mocked_get(*args, **kwargs):
+        calls.append(kwargs)
+        result = results[len(calls) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(requests, 'get', mocked_get)
+    return calls
+
+
+def make_response(http_status=HTTPStatus.OK, headers=None, data=None):
+    response = check_utils.MockResponseGET(
+        random_timestamp=1000198000, http_status=http_status, data=data
+    )
+    response.headers = headers or {}
+    return response
+
+
+class TestRetry:
+    @pytest.mark.parametrize('http_status', [
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ])
+    def test_retried_statuses(
+            self, monkeypatch, sleeps, homework_module, http_status
+    ):
+        calls = mock_responses(
+            monkeypatch, make_response(http_status), make_response()
+        )
+        response = homework_module.request_with_retry(0, {})
+        assert response.status_code == HTTPStatus.OK
+        assert len(calls) == 2
+        assert len(sleeps) == 1
+
+    def test_internal_server_error_is_not_retried(
+            self, monkeypatch, sleeps, homework_module
+    ):
+        calls = mock_responses(
+            monkeypatch, make_response(HTTPStatus.INTERNAL_SERVER_ERROR)
+        )
+        response = homework_module.request_with_retry(0, {})
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert len(calls) == 1
+        assert not sleeps
+
+    def test_last_attempt_raises(self, monkeypatch, sleeps, homework_module):
+        attempts = homework_module.RETRY_ATTEMPTS
+        calls = mock_responses(
+            monkeypatch,
+            *[requests.ConnectionError('down')] * attempts
+        )
+        with pytest.raises(requests.ConnectionError):
+            homework_module.request_with_retry(0, {})
+        assert len(calls) == attempts
+        assert len(sleeps) == attempts - 1
+
+    def test_last_attempt_returns_retried_status(
+            self, monkeypatch, sleeps, homework_module
+    ):
+        attempts = homework_module.RETRY_ATTEMPTS
+        mock_responses(
+            monkeypatch,
+            *[make_response(HTTPStatus.SERVICE_UNAVAILABLE)] * attempts
+        )
+        response = homework_module.request_with_retry(0, {})
+        assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+        assert len(sleeps) == attempts - 1
+
+    def test_retry_after_is_respected(
+            self, monkeypatch, sleeps, homework_module
+    ):
+        mock_responses(
+            monkeypatch,
+            make_response(
+                HTTPStatus.TOO_MANY_REQUESTS, headers={'Retry-After': '7'}
+            ),
+            make_response()
+        )
+        homework_module.request_with_retry(0, {})
+        assert sleeps == [7]
+
+    def test_long_retry_after_is_not_waited(
+            self, monkeypatch, sleeps, homework_module
+    ):
+        calls = mock_responses(
+            monkeypatch,
+            make_response(
+                HTTPStatus.TOO_MANY_REQUESTS, headers={'Retry-After': '3600'}
+            )
+        )
+        response = homework_module.request_with_retry(0, {})
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert len(calls) == 1
+        assert not sleeps
+
+    def test_backoff_bounds(self, homework_module):
+        cap = homework_module.RETRY_BACKOFF_CAP
+        for attempt in range(10):
+            delay = homework_module.get_retry_delay(attempt)
+            assert min(2 ** attempt, cap) <= delay <= cap
+            assert delay < 2 ** attempt + 1
+
+
+class TestConditionalRequest:
+    DATA = {'homeworks': [], 'current_date': 1000198000}
+
+    @staticmethod
+    def not_modified_response():
+        response = make_response(HTTPStatus.NOT_MODIFIED)
+        response.content = b''
+
+        def json():
+            raise AssertionError('Ответ `304` не должен декодироваться.')
+
+        response.json = json
+        return response
+
+    def test_not_modified_returns_cached_answer(
+            self, monkeypatch, homework_module
+    ):
+        calls = mock_responses(
+            monkeypatch,
+            make_response(headers={'ETag': '"v1"'}, data=self.DATA),
+            self.not_modified_response()
+        )
+        first = homework_module.get_api_answer(100)
+        second = homework_module.get_api_answer(100)
+        assert 'If-None-Match' not in calls[0]['headers']
+        assert calls[1]['headers']['If-None-Match'] == '"v1"'
+        assert calls[1]['headers']['Authorization'].startswith('OAuth ')
+        assert second == first == self.DATA
+
+    def test_changed_from_date_sends_no_etag(
+            self, monkeypatch, homework_module
+    ):
+        calls = mock_responses(
+            monkeypatch,
+            make_response(headers={'ETag': '"v1"'}, data=self.DATA),
+            make_response(data=self.DATA)
+        )
+        homework_module.get_api_answer(100)
+        homework_module.get_api_answer(200)
+        assert 'If-None-Match' not in calls[1]['headers']
+
+    def test_response_without_etag_is_not_cached(
+            self, monkeypatch, homework_module
+    ):
+        calls = mock_responses(
+            monkeypatch,
+            make_response(data=self.DATA),
+            make_response(data=self.DATA)
+        )
+        homework_module.get_api_answer(100)
+        homework_module.get_api_answer(100)
+        assert 'If-None-Match' not in calls[1]['headers']
+
+
+class TestMainLoop:
+    @pytest.fixture
+    def run_main(self, monkeypatch, main_env, homework_module):
+        """Run `main()` over given API answers, return requested dates."""
+        def run(answers):
+            remaining = iter(answers)
+            requested = []
+
+            def mock_get_api_answer(timestamp):
+                requested.append(timestamp)
+                return next(remaining)
+
+            def mock_sleep(secs):
+                if len(requested) == len(answers):
+                    raise check_utils.BreakInfiniteLoop('break')
+
+            monkeypatch.setattr(
+                homework_module, 'get_api_answer', mock_get_api_answer
+            )
+            monkeypatch.setattr(homework_module.time, 'sleep', mock_sleep)
+            with pytest.raises(check_utils.BreakInfiniteLoop):
+                homework_module.main()
+            return requested
+
+        return run
+
+    def test_empty_polls_keep_from_date(self, run_main):
+        homework = {'id': 1, 'homework_name': 'hw', 'status': 'approved'}
+        requested = run_main([
+            {'homeworks': [], 'current_date': 10},
+            {'homeworks': [], 'current_date': 20},
+            {'homeworks': [homework], 'current_date': 30},
+            {'homeworks': [], 'current_date': 40},
+        ])
+        assert requested[0] == requested[1] == requested[2]
+        assert requested[3] == 30
+
+    def test_failed_send_keeps_from_date(
+            self, monkeypatch, run_main, homework_module
+    ):
+        sent = []
+
+        def mock_send_message(bot, message):
+            if not sent:
+                sent.append(None)
+                raise ConnectionError('Telegram недоступен')
+            sent.append(message)
+
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        homework = {'id': 1, 'homework_name': 'hw', 'status': 'approved'}
+        requested = run_main([
+            {'homeworks': [homework], 'current_date': 30},
+            {'homeworks': [homework], 'current_date': 40},
+        ])
+        assert requested[1] == requested[0]
+        verdict = homework_module.HOMEWORK_VERDICTS['approved']
+        assert any(message and verdict in message for message in sent)
+
+
+class TestSendStatuses:
+    @pytest.fixture
+    def sent(self, monkeypatch, homework_module):
+        messages = []
+        monkeypatch.setattr(
+            homework_module, 'send_message',
+            lambda bot, message: messages.append(message)
+        )
+        return messages
+
+    def test_repeated_status_is_skipped(self, sent, homework_module):
+        sent_statuses = {}
+        homework = {'id': 1, 'homework_name': 'hw', 'status': 'reviewing'}
+        homework_module.send_statuses(None, [homework], sent_statuses)
+        homework_module.send_statuses(None, [homework], sent_statuses)
+        assert len(sent) == 1
+
+        homework = {**homework, 'status': 'approved'}
+        homework_module.send_statuses(None, [homework], sent_statuses)
+        assert len(sent) == 2
+        assert sent_statuses == {1: 'approved'}
+
+    def test_homeworks_without_id_are_kept_apart(
+            self, sent, homework_module
+    ):
+        homeworks = [
+            {'homework_name': 'hw1', 'status': 'approved'},
+            {'homework_name': 'hw2', 'status': 'approved'},
+            {'id': None, 'homework_name': 'hw3', 'status': 'approved'},
+            {'id': None, 'homework_name': 'hw4', 'status': 'approved'},
+        ]
+        homework_module.send_statuses(None, homeworks, {})
+        assert len(sent) == 4
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self, monkeypatch, homework_module):
+        """Patch the monotonic clock; return a list holding its value."""
+        now = [1000.0]
+        monkeypatch.setattr(
+            homework_module.time, 'monotonic', lambda: now[0]
+        )
+        return now
+
+    @pytest.fixture
+    def fetch_calls(self, monkeypatch, homework_module):
+        """Make `fetch_api_answer` fail while `outcome['fail']` is set."""
+        calls = []
+        outcome = {'fail': True}
+
+        def mock_fetch(timestamp):
+            calls.append(timestamp)
+            if outcome['fail']:
+                raise ConnectionError('API недоступно')
+            return {'homeworks': [], 'current_date': timestamp}
+
+        monkeypatch.setattr(homework_module, 'fetch_api_answer', mock_fetch)
+        return calls, outcome
+
+    def test_closed_open_half_open(self, clock, fetch_calls, homework_module):
+        calls, outcome = fetch_calls
+        for _ in range(homework_module.BREAKER_THRESHOLD):
+            with pytest.raises(ConnectionError):
+                homework_module.get_api_answer(0)
+        assert len(calls) == homework_module.BREAKER_THRESHOLD
+
+        # Open: the next poll after the usual pause sends no request.
+        clock[0] += homework_module.RETRY_PERIOD
+        with pytest.raises(homework_module.ApiCircuitOpenError):
+            homework_module.get_api_answer(0)
+        assert len(calls) == homework_module.BREAKER_THRESHOLD
+
+        # Half-open: a failed probe opens the breaker again.
+        clock[0] += homework_module.BREAKER_COOLDOWN
+        with pytest.raises(ConnectionError):
+            homework_module.get_api_answer(0)
+        assert len(calls) == homework_module.BREAKER_THRESHOLD + 1
+        with pytest.raises(homework_module.ApiCircuitOpenError):
+            homework_module.get_api_answer(0)
+
+        # A successful probe closes the breaker.
+        clock[0] += homework_module.BREAKER_COOLDOWN
+        outcome['fail'] = False
+        assert homework_module.get_api_answer(0)
+        assert homework_module.api_failures == 0
+        outcome['fail'] = True
+        with pytest.raises(ConnectionError):
+            homework_module.get_api_answer(0)
+
+    def test_open_breaker_skips_next_poll_in_main(
+            self, monkeypatch, clock, main_env, homework_module
+    ):
+        threshold = homework_module.BREAKER_THRESHOLD
+        attempts = homework_module.RETRY_ATTEMPTS
+        calls = mock_responses(
+            monkeypatch,
+            *[requests.ConnectionError('down')] * (threshold * attempts)
+        )
+        polls = []
+
+        def mock_sleep(secs):
+            clock[0] += secs
+            if inspect.stack()[1].function != 'main':
+                return
+            polls.append(secs)
+            if len(polls) == threshold + 1:
+                raise check_utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(homework_module.time, 'sleep', mock_sleep)
+        with pytest.raises(check_utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert len(calls) == threshold * attempts, (
+            'Open breaker must not send a request on the next poll.'
+        )